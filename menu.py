@@ -1,16 +1,94 @@
+import calendar
 import os
 import re
-from datetime import date, datetime
-from typing import Any, Callable, Iterable, TypeVar, overload
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Generic, Iterable, TypeVar, overload
 
 from rich import print
 from simple_term_menu import TerminalMenu
 
-from utils import bad_input, error, stress
+from utils import bad_input, error, stress, warning
 
 T = TypeVar("T")
 CT = TypeVar("CT", bound=Callable)
 
+_DATE_FORMAT_DISPLAY = {
+    "%d": "dd",
+    "%b": "MMM",
+    "%m": "mm",
+    "%y": "yy",
+    "%Y": "YYYY",
+}
+_DATE_FORMAT_PATTERNS = {
+    "%d": r"(?P<d>\d{1,2})",
+    "%b": r"(?P<b>[^\W\d_]+)",
+    "%m": r"(?P<m>\d{1,2})",
+    "%y": r"(?P<y>\d{2})",
+    "%Y": r"(?P<Y>\d{4})",
+}
+
+
+class OptionProvider(Generic[T]):
+    def __init__(
+        self,
+        fetch: Callable[[], list[str] | tuple[str] | dict[str, T]],
+        /,
+        ttl: float = 30,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._options: list[str] | tuple[str] | dict[str, T] | None = None
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._report_error = False
+        self.last_error: Exception | None = None
+
+    def get(self) -> list[str] | tuple[str] | dict[str, T]:
+        with self._lock:
+            if self._options is None:
+                self._options = self.fetch()
+                self._fetched_at = time.monotonic()
+            elif (
+                not self._refreshing
+                and time.monotonic() - self._fetched_at >= self.ttl
+            ):
+                self._refreshing = True
+                threading.Thread(target=self._refresh, daemon=True).start()
+
+            if self._report_error:
+                self._report_error = False
+                print(
+                    warning(
+                        f"Could not refresh options ({self.last_error!r}), "
+                        "showing the last fetched ones"
+                    )
+                )
+            return self._options
+
+    def refresh(self) -> None:
+        options = self.fetch()
+        with self._lock:
+            self._options = options
+            self._fetched_at = time.monotonic()
+            self.last_error = None
+
+    def _refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            with self._lock:
+                self.last_error = e
+                self._report_error = True
+                self._fetched_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
 
 class Menu:
     @staticmethod
@@ -65,6 +143,84 @@ class Menu:
             return False
         return True
 
+    @staticmethod
+    def _cast_items(
+        cast: CT,
+        items: list[str],
+        /,
+        *,
+        workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> tuple[list, list[str]]:
+        if executor is None and workers is not None:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return Menu._cast_items(cast, items, executor=pool)
+
+        values, failures = [], []
+        pending = (
+            [(item, executor.submit(cast, item)) for item in items]
+            if executor is not None
+            else [(item, None) for item in items]
+        )
+        for item, future in pending:
+            try:
+                value = cast(item) if future is None else future.result()
+            except ValueError:
+                failures.append(item)
+            else:
+                values.append(value)
+        return values, failures
+
+    @staticmethod
+    def _display_date_format(format: str) -> str:
+        if "%" in re.sub("%[dbmyY]", "", format):
+            raise ValueError(f"Only `{'`, `'.join(_DATE_FORMAT_DISPLAY)}` are supported")
+
+        _format = format
+        for k, v in _DATE_FORMAT_DISPLAY.items():
+            _format = _format.replace(k, v)
+        return _format
+
+    @staticmethod
+    @lru_cache
+    def _compile_date_format(format: str) -> re.Pattern:
+        Menu._display_date_format(format)
+        pattern = "".join(
+            _DATE_FORMAT_PATTERNS.get(part, re.escape(part))
+            for part in re.split("(%[dbmyY])", format)
+        )
+        try:
+            return re.compile(pattern, re.IGNORECASE | re.ASCII)
+        except re.error:
+            raise ValueError(f"Each token can be used only once in `{format}`")
+
+    @staticmethod
+    @lru_cache
+    def _month_numbers() -> dict[str, int]:
+        return {m.lower(): i for i, m in enumerate(calendar.month_abbr) if m}
+
+    @staticmethod
+    def _parse_date(raw: str, pattern: re.Pattern) -> date:
+        match = pattern.fullmatch(raw)
+        if match is None:
+            raise ValueError(raw)
+        parts = match.groupdict()
+
+        if "Y" in parts:
+            year = int(parts["Y"])
+        elif "y" in parts:
+            year = int(parts["y"])
+            year += 2000 if year <= 68 else 1900
+        else:
+            year = 1900
+        if "b" in parts:
+            month = Menu._month_numbers().get(parts["b"].lower())
+            if month is None:
+                raise ValueError(raw)
+        else:
+            month = int(parts.get("m", 1))
+        return date(year, month, int(parts.get("d", 1)))
+
     @overload
     def _get_multi(
         self,
@@ -78,6 +234,8 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> list[T]:
         ...
 
@@ -94,6 +252,8 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> tuple[T]:
         ...
 
@@ -109,6 +269,8 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> set[T]:
         ...
 
@@ -124,16 +286,27 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> list[CT] | tuple[CT] | set[CT]:
+        if cast_workers is not None and executor is not None:
+            raise ValueError("Only one of `cast_workers` and `executor` can be given")
+        if cast_workers is not None and cast_workers < 1:
+            raise ValueError("`cast_workers` must be greater than 0")
+
         _d = f" {list(default)}" if default is not None else ""
         raw = input(
             f"{prompt_text} (Seperate values by `{separator}`){_d}{delimiter}"
         ).strip()
-        try:
-            cleaned = sequence(map(cast, map(str.strip, raw.split(separator))))
-        except ValueError:
+        values, failures = Menu._cast_items(
+            cast,
+            list(map(str.strip, raw.split(separator))),
+            workers=cast_workers,
+            executor=executor,
+        )
+        if failures:
             if len(raw) != 0 or default is None:
-                Menu._invalid_input()
+                Menu._invalid_input(", ".join(failures))
                 cleaned = self._get_multi(
                     sequence,
                     cast,
@@ -143,10 +316,13 @@ class Menu:
                     separator=separator,
                     min_length=min_length,
                     max_length=max_length,
+                    cast_workers=cast_workers,
+                    executor=executor,
                 )
             else:
                 cleaned = default
         else:
+            cleaned = sequence(values)
             if not Menu._validate_range(
                 cleaned, min_value=min_length, max_value=max_length
             ):
@@ -159,6 +335,8 @@ class Menu:
                     separator=separator,
                     min_length=min_length,
                     max_length=max_length,
+                    cast_workers=cast_workers,
+                    executor=executor,
                 )
         return cleaned
 
@@ -255,6 +433,8 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> list[CT]:
         return self._get_multi(
             list,
@@ -265,6 +445,8 @@ class Menu:
             separator=separator,
             min_length=min_length,
             max_length=max_length,
+            cast_workers=cast_workers,
+            executor=executor,
         )
 
     def get_tuple(
@@ -278,6 +460,8 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> tuple[CT]:
         return self._get_multi(
             tuple,
@@ -288,6 +472,8 @@ class Menu:
             separator=separator,
             min_length=min_length,
             max_length=max_length,
+            cast_workers=cast_workers,
+            executor=executor,
         )
 
     def get_set(
@@ -301,6 +487,8 @@ class Menu:
         separator: str = ",",
         min_length: int | None = None,
         max_length: int | None = None,
+        cast_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> set[CT]:
         return self._get_multi(
             set,
@@ -311,6 +499,8 @@ class Menu:
             separator=separator,
             min_length=min_length,
             max_length=max_length,
+            cast_workers=cast_workers,
+            executor=executor,
         )
 
     def get_str(
@@ -360,19 +550,7 @@ class Menu:
         before: date | None = None,
         format: str = "%d/%m/%y",
     ) -> date:
-        _format_display_map = {
-            "%d": "dd",
-            "%b": "MMM",
-            "%m": "mm",
-            "%y": "yy",
-            "%Y": "YYYY",
-        }
-        if "%" in re.sub("%[dbmyY]", "", format):
-            raise ValueError(f"Only `{'`, `'.join(_format_display_map)}` are supported")
-
-        _format = format
-        for k, v in _format_display_map.items():
-            _format = _format.replace(k, v)
+        _format = Menu._display_date_format(format)
         _default = default.strftime(format) if default else None
 
         raw = self.get_str(
@@ -411,6 +589,113 @@ class Menu:
 
         return cleaned
 
+    def get_dates(
+        self,
+        prompt_text: str = "",
+        /,
+        default: list[date] = None,
+        *,
+        delimiter: str = ": ",
+        separator: str = ",",
+        range_separator: str = "..",
+        after: date | None = None,
+        before: date | None = None,
+        format: str = "%d/%m/%y",
+        min_length: int | None = None,
+        max_length: int | None = None,
+    ) -> list[date]:
+        _format = Menu._display_date_format(format)
+        pattern = Menu._compile_date_format(format)
+        for name, value in (
+            ("separator", separator),
+            ("range_separator", range_separator),
+        ):
+            if not value or value in format:
+                raise ValueError(f"`{name}` must be non-empty and not in `{format}`")
+        if separator in range_separator or range_separator in separator:
+            raise ValueError("`separator` and `range_separator` must not overlap")
+        _d = (
+            f" [{separator.join(d.strftime(format) for d in default)}]"
+            if default is not None
+            else ""
+        )
+        raw = input(
+            f"{prompt_text} ({_format}) (Seperate values by `{separator}`, "
+            f"ranges by `{range_separator}`){_d}{delimiter}"
+        ).strip()
+
+        spans, failures = [], []
+        for item in map(str.strip, raw.split(separator)):
+            start, is_range, end = map(str.strip, item.partition(range_separator))
+            try:
+                first = Menu._parse_date(start, pattern)
+                last = Menu._parse_date(end, pattern) if is_range else first
+            except ValueError:
+                failures.append(item)
+                continue
+            if first > last:
+                failures.append(item)
+                continue
+            spans.append((first, last))
+        count = sum((last - first).days + 1 for first, last in spans)
+
+        if failures:
+            if len(raw) != 0 or default is None:
+                Menu._invalid_input(", ".join(failures))
+                cleaned = self.get_dates(
+                    prompt_text,
+                    default,
+                    delimiter=delimiter,
+                    separator=separator,
+                    range_separator=range_separator,
+                    after=after,
+                    before=before,
+                    format=format,
+                    min_length=min_length,
+                    max_length=max_length,
+                )
+            else:
+                cleaned = default
+        elif (after is not None and min(first for first, _ in spans) < after) or (
+            before is not None and max(last for _, last in spans) > before
+        ):
+            Menu._range_error(min_value=after, max_value=before, type="date")
+            cleaned = self.get_dates(
+                prompt_text,
+                default,
+                delimiter=delimiter,
+                separator=separator,
+                range_separator=range_separator,
+                after=after,
+                before=before,
+                format=format,
+                min_length=min_length,
+                max_length=max_length,
+            )
+        elif (min_length is not None and count < min_length) or (
+            max_length is not None and count > max_length
+        ):
+            Menu._range_error(min_value=min_length, max_value=max_length, type="length")
+            cleaned = self.get_dates(
+                prompt_text,
+                default,
+                delimiter=delimiter,
+                separator=separator,
+                range_separator=range_separator,
+                after=after,
+                before=before,
+                format=format,
+                min_length=min_length,
+                max_length=max_length,
+            )
+        else:
+            cleaned = [
+                first + timedelta(days=i)
+                for first, last in spans
+                for i in range((last - first).days + 1)
+            ]
+        return cleaned
+
     def confirm(self, prompt_text: str, /, default: bool | None = None) -> bool:
         raw = TerminalMenu(
             (
@@ -430,6 +715,74 @@ class Menu:
             cleaned = raw == 0
         return cleaned
 
+    def _choose_provided(
+        self,
+        prompt_text: str,
+        provider: OptionProvider[T],
+        default: int | str = None,
+    ) -> int | T:
+        labels = list(provider.get())
+        if isinstance(default, int):
+            default = labels[default] if default < len(labels) else None
+        _default = default if default in labels else None
+
+        raw = self.choose(prompt_text, labels, _default)
+        label = raw if isinstance(raw, str) else labels[raw]
+
+        latest = provider.get()
+        if label not in latest:
+            Menu._invalid_input(label)
+            return self._choose_provided(prompt_text, provider, _default)
+        return (
+            latest[label] if isinstance(latest, dict) else list(latest).index(label)
+        )
+
+    def _choose_multi_provided(
+        self,
+        prompt_text: str,
+        provider: OptionProvider[T],
+        default: Iterable[int] | Iterable[str] = None,
+        *,
+        min_length: int | None = None,
+        max_length: int | None = None,
+    ) -> list[int] | list[T]:
+        labels = list(provider.get())
+        _default = (
+            [
+                labels[d] if isinstance(d, int) else d
+                for d in default
+                if (d < len(labels) if isinstance(d, int) else d in labels)
+            ]
+            if default is not None
+            else None
+        )
+
+        raw = self.choose_multi(
+            prompt_text,
+            labels,
+            _default,
+            min_length=min_length,
+            max_length=max_length,
+        )
+        chosen = [labels[r] for r in raw]
+
+        latest = provider.get()
+        missing = [c for c in chosen if c not in latest]
+        if missing:
+            Menu._invalid_input(", ".join(missing))
+            return self._choose_multi_provided(
+                prompt_text,
+                provider,
+                [c for c in chosen if c in latest],
+                min_length=min_length,
+                max_length=max_length,
+            )
+        return (
+            [latest[c] for c in chosen]
+            if isinstance(latest, dict)
+            else [list(latest).index(c) for c in chosen]
+        )
+
     @overload
     def choose(
         prompt_text: str, /, options: list[str] | tuple[str], default: int | str
@@ -440,13 +793,22 @@ class Menu:
     def choose(prompt_text: str, /, options: dict[str, T], default: str) -> T:
         ...
 
+    @overload
+    def choose(
+        prompt_text: str, /, options: OptionProvider[T], default: int | str
+    ) -> int | T:
+        ...
+
     def choose(
         self,
         prompt_text: str,
         /,
-        options: list[str] | tuple[str] | dict[str, T],
+        options: list[str] | tuple[str] | dict[str, T] | OptionProvider[T],
         default: int | str = None,
     ) -> int | T:
+        if isinstance(options, OptionProvider):
+            return self._choose_provided(prompt_text, options, default)
+
         _options = list(options)
         _default = _options.index(default) if isinstance(default, str) else default
 
@@ -499,16 +861,37 @@ class Menu:
     ) -> list[T]:
         ...
 
+    @overload
+    def choose_multi(
+        prompt_text: str,
+        /,
+        options: OptionProvider[T],
+        default: Iterable[int] | Iterable[str],
+        *,
+        min_length: int | None = None,
+        max_length: int | None = None,
+    ) -> list[int] | list[T]:
+        ...
+
     def choose_multi(
         self,
         prompt_text: str,
-        options: list[str] | tuple[str] | dict[str, T],
+        options: list[str] | tuple[str] | dict[str, T] | OptionProvider[T],
         /,
         default: Iterable[int] | Iterable[str] = None,
         *,
         min_length: int | None = None,
         max_length: int | None = None,
     ) -> int | T:
+        if isinstance(options, OptionProvider):
+            return self._choose_multi_provided(
+                prompt_text,
+                options,
+                default,
+                min_length=min_length,
+                max_length=max_length,
+            )
+
         _options = list(options)
         raw = TerminalMenu(
             _options,
@@ -552,7 +935,7 @@ class Menu:
 
 
 if __name__ == "__main__":
-    from datetime import timedelta
+    from random import sample
 
     def _break() -> None:
         print("=" * 30, "\n")
@@ -614,6 +997,15 @@ if __name__ == "__main__":
         "You entered the date",
         menu.get_date("Enter a date before today", before=tdy, format="%d-%m-%Y"),
     )
+    print(
+        "You entered the dates",
+        menu.get_dates(
+            "Enter dates within the next month",
+            after=tdy,
+            before=tdy + timedelta(days=31),
+            format="%d %b %Y",
+        ),
+    )
 
     _break()
     print("Hmm..." if menu.confirm("Are you sure to continue?") else "Let me ask again")
@@ -689,3 +1081,13 @@ if __name__ == "__main__":
             )
         ),
     )
+
+    _break()
+    jobs = OptionProvider(
+        lambda: {f"Job {j}": j for j in sorted(sample(range(10), 4))}, ttl=2
+    )
+    print("You chose job", menu.choose("Choose a running job", jobs))
+    print(
+        "You chose jobs",
+        ", ".join(map(str, menu.choose_multi("Choose running jobs", jobs))),
+    )